@@ -14,10 +14,46 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import sys
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 
+# Interned modality keys. Keys containing a "." are not interned automatically by CPython, so interning them
+# lets dictionary lookups between interned keys short-circuit on identity.
+_OBS_IMAGE = sys.intern("observation.image")
+_OBS_STATE = sys.intern("observation.state")
+_ACTION = sys.intern("action")
 
-@dataclass
+# Defaults for the dictionary fields of `DiffusionConfig`. They are built once at import time (with interned keys
+# and tuple shapes) and each config instance receives a shallow copy, which `__post_init__` leaves as is.
+_DEFAULT_INPUT_SHAPES = {
+    _OBS_IMAGE: (3, 96, 96),
+    _OBS_STATE: (2,),
+}
+_DEFAULT_OUTPUT_SHAPES = {
+    _ACTION: (2,),
+}
+_DEFAULT_INPUT_NORMALIZATION_MODES = {
+    _OBS_IMAGE: "mean_std",
+    _OBS_STATE: "min_max",
+}
+_DEFAULT_OUTPUT_NORMALIZATION_MODES = {
+    _ACTION: "min_max",
+}
+
+# Statistics required in `normalization_stats` for each normalization mode.
+_REQUIRED_STATS_PER_NORMALIZATION_MODE = {"mean_std": ("mean", "std"), "min_max": ("min", "max")}
+# Allowed values for the enum-like fields, checked in `DiffusionConfig.__post_init__`.
+_SUPPORTED_PREDICTION_TYPES = ("epsilon", "sample")
+_SUPPORTED_NOISE_SCHEDULERS = ("DDPM", "DDIM")
+# Beta schedules supported by each of the noise schedulers from Hugging Face diffusers.
+_SUPPORTED_BETA_SCHEDULES = {
+    "DDPM": ("linear", "scaled_linear", "squaredcos_cap_v2", "sigmoid"),
+    "DDIM": ("linear", "scaled_linear", "squaredcos_cap_v2"),
+}
+
+
+@dataclass(slots=True, frozen=True)
 class DiffusionConfig:
     """Configuration class for DiffusionPolicy.
 
@@ -40,20 +76,26 @@ class DiffusionConfig:
         n_action_steps: The number of action steps to run in the environment for one invocation of the policy.
             See `DiffusionPolicy.select_action` for more details.
         input_shapes: A dictionary defining the shapes of the input data for the policy. The key represents
-            the input data name, and the value is a list indicating the dimensions of the corresponding data.
-            For example, "observation.image" refers to an input from a camera with dimensions [3, 96, 96],
+            the input data name, and the value is a tuple indicating the dimensions of the corresponding data.
+            For example, "observation.image" refers to an input from a camera with dimensions (3, 96, 96),
             indicating it has three color channels and 96x96 resolution. Importantly, `input_shapes` doesn't
             include batch dimension or temporal dimension.
         output_shapes: A dictionary defining the shapes of the output data for the policy. The key represents
-            the output data name, and the value is a list indicating the dimensions of the corresponding data.
-            For example, "action" refers to an output shape of [14], indicating 14-dimensional actions.
-            Importantly, `output_shapes` doesn't include batch dimension or temporal dimension.
+            the output data name, and the value is a tuple indicating the dimensions of the corresponding data.
+            For example, "action" refers to an output shape of (14,), indicating 14-dimensional actions.
+            Importantly, `output_shapes` doesn't include batch dimension or temporal dimension. Shapes provided
+            as lists (e.g. from a Hydra config) are converted to tuples at construction.
         input_normalization_modes: A dictionary with key representing the modality (e.g. "observation.state"),
             and the value specifies the normalization mode to apply. The two available modes are "mean_std"
             which subtracts the mean and divides by the standard deviation and "min_max" which rescale in a
             [-1, 1] range.
         output_normalization_modes: Similar dictionary as `normalize_input_modes`, but to unnormalize to the
             original scale. Note that this is also used for normalizing the training targets.
+        normalization_stats: Optional precomputed statistics for (un)normalization, keyed by modality. For
+            example `{"observation.state": {"min": (0.0, 0.0), "max": (512.0, 512.0)}}`. Each modality needs
+            the "mean" and "std" entries for "mean_std" mode, or "min" and "max" for "min_max" mode. Image
+            statistics are given per channel. These take precedence over the dataset statistics passed to
+            the policy, for the modalities they cover.
         vision_backbone: Name of the torchvision resnet backbone to use for encoding images.
         crop_shape: (H, W) shape to crop images to as a preprocessing step for the vision backbone. Must fit
             within the image size. If None, no cropping is done.
@@ -88,9 +130,16 @@ class DiffusionConfig:
         clip_sample_range: The magnitude of the clipping range as described above.
         num_inference_steps: Number of reverse diffusion steps to use at inference time (steps are evenly
             spaced). If not provided, this defaults to be the same as `num_train_timesteps`.
+        dp_cache_stable_range: Optional [start, end) range of reverse diffusion step indices (counted from 0
+            over the `num_inference_steps` steps) in which the Unet output is considered stable enough to be
+            cached and reused across steps. If None, the Unet is evaluated at every step.
+        dp_cache_stride: Within `dp_cache_stable_range`, the Unet is only evaluated every `dp_cache_stride`
+            steps and its output is reused for the steps in between. A value of 1 disables caching.
         do_mask_loss_for_padding: Whether to mask the loss when there are copy-padded actions. See
             `LeRobotDataset` and `load_previous_and_future_frames` for mor information. Note, this defaults
             to False as the original Diffusion Policy implementation does the same.
+
+    Note: instances are frozen. Use `dataclasses.replace` to derive a modified configuration.
     """
 
     # Inputs / output structure.
@@ -98,26 +147,15 @@ class DiffusionConfig:
     horizon: int = 16
     n_action_steps: int = 8
 
-    input_shapes: dict[str, list[int]] = field(
-        default_factory=lambda: {
-            "observation.image": [3, 96, 96],
-            "observation.state": [2],
-        }
-    )
-    output_shapes: dict[str, list[int]] = field(
-        default_factory=lambda: {
-            "action": [2],
-        }
-    )
+    input_shapes: dict[str, tuple[int, ...]] = field(default_factory=_DEFAULT_INPUT_SHAPES.copy)
+    output_shapes: dict[str, tuple[int, ...]] = field(default_factory=_DEFAULT_OUTPUT_SHAPES.copy)
 
     # Normalization / Unnormalization
-    input_normalization_modes: dict[str, str] = field(
-        default_factory=lambda: {
-            "observation.image": "mean_std",
-            "observation.state": "min_max",
-        }
+    input_normalization_modes: dict[str, str] = field(default_factory=_DEFAULT_INPUT_NORMALIZATION_MODES.copy)
+    output_normalization_modes: dict[str, str] = field(
+        default_factory=_DEFAULT_OUTPUT_NORMALIZATION_MODES.copy
     )
-    output_normalization_modes: dict[str, str] = field(default_factory=lambda: {"action": "min_max"})
+    normalization_stats: dict[str, dict[str, tuple[float, ...]]] | None = None
 
     # Architecture / modeling.
     # Vision backbone.
@@ -145,12 +183,43 @@ class DiffusionConfig:
 
     # Inference
     num_inference_steps: int | None = None
+    dp_cache_stable_range: tuple[int, int] | None = None
+    dp_cache_stride: int = 1
 
     # Loss computation
     do_mask_loss_for_padding: bool = False
 
+    @property
+    def resolved_num_inference_steps(self) -> int:
+        """Number of reverse diffusion steps used at inference time, with the `num_train_timesteps` default."""
+        if self.num_inference_steps is None:
+            return self.num_train_timesteps
+        return self.num_inference_steps
+
+    @property
+    def resolved_crop_shape(self) -> tuple[int, int]:
+        """(H, W) of the images fed to the vision backbone: `crop_shape`, or the input image size if None."""
+        if self.crop_shape is not None:
+            return tuple(self.crop_shape)
+        image_key = next(k for k in self.input_shapes if k.startswith("observation.image"))
+        return self.input_shapes[image_key][1:]
+
     def __post_init__(self):
         """Input validation (not exhaustive)."""
+        # Store shapes as (hashable) tuples, whatever sequence type they were provided as, and intern the
+        # modality keys of all the per-modality dictionaries. Dictionaries that are already in that form (like
+        # the defaults) are kept as is.
+        for name in ("input_shapes", "output_shapes"):
+            value = getattr(self, name)
+            if not all(type(v) is tuple and sys.intern(k) is k for k, v in value.items()):
+                object.__setattr__(self, name, {sys.intern(k): tuple(v) for k, v in value.items()})
+        for name in ("input_normalization_modes", "output_normalization_modes"):
+            value = getattr(self, name)
+            if not all(sys.intern(k) is k for k in value):
+                object.__setattr__(self, name, {sys.intern(k): v for k, v in value.items()})
+        if self.dp_cache_stable_range is not None:
+            object.__setattr__(self, "dp_cache_stable_range", tuple(self.dp_cache_stable_range))
+
         if not self.vision_backbone.startswith("resnet"):
             raise ValueError(
                 f"`vision_backbone` must be one of the ResNet variants. Got {self.vision_backbone}."
@@ -175,14 +244,80 @@ class DiffusionConfig:
                     f"`input_shapes[{image_key}]` does not match `input_shapes[{first_image_key}]`, but we "
                     "expect all image shapes to match."
                 )
-        supported_prediction_types = ["epsilon", "sample"]
-        if self.prediction_type not in supported_prediction_types:
+        if self.prediction_type not in _SUPPORTED_PREDICTION_TYPES:
             raise ValueError(
-                f"`prediction_type` must be one of {supported_prediction_types}. Got {self.prediction_type}."
+                f"`prediction_type` must be one of {list(_SUPPORTED_PREDICTION_TYPES)}. "
+                f"Got {self.prediction_type}."
             )
-        supported_noise_schedulers = ["DDPM", "DDIM"]
-        if self.noise_scheduler_type not in supported_noise_schedulers:
+        if self.noise_scheduler_type not in _SUPPORTED_NOISE_SCHEDULERS:
             raise ValueError(
-                f"`noise_scheduler_type` must be one of {supported_noise_schedulers}. "
+                f"`noise_scheduler_type` must be one of {list(_SUPPORTED_NOISE_SCHEDULERS)}. "
                 f"Got {self.noise_scheduler_type}."
             )
+        supported_beta_schedules = _SUPPORTED_BETA_SCHEDULES[self.noise_scheduler_type]
+        if self.beta_schedule not in supported_beta_schedules:
+            raise ValueError(
+                f"`beta_schedule` must be one of {list(supported_beta_schedules)} for the "
+                f"{self.noise_scheduler_type} noise scheduler. Got {self.beta_schedule}."
+            )
+        if self.num_train_timesteps < 1:
+            raise ValueError(f"`num_train_timesteps` must be positive. Got {self.num_train_timesteps}.")
+        if self.num_inference_steps is not None and self.num_inference_steps < 1:
+            raise ValueError(f"`num_inference_steps` must be positive. Got {self.num_inference_steps}.")
+        if self.clip_sample_range <= 0:
+            raise ValueError(f"`clip_sample_range` must be positive. Got {self.clip_sample_range}.")
+        if self.dp_cache_stride < 1:
+            raise ValueError(f"`dp_cache_stride` must be positive. Got {self.dp_cache_stride}.")
+        if self.dp_cache_stable_range is not None:
+            num_inference_steps = self.resolved_num_inference_steps
+            if len(self.dp_cache_stable_range) != 2 or not (
+                0 <= self.dp_cache_stable_range[0] < self.dp_cache_stable_range[1] <= num_inference_steps
+            ):
+                raise ValueError(
+                    "`dp_cache_stable_range` must be a (start, end) pair with "
+                    f"0 <= start < end <= {num_inference_steps}. Got {self.dp_cache_stable_range}."
+                )
+        if self.normalization_stats is not None:
+            normalization_modes = {**self.input_normalization_modes, **self.output_normalization_modes}
+            shapes = {**self.input_shapes, **self.output_shapes}
+            for key, stats in self.normalization_stats.items():
+                if key not in normalization_modes:
+                    raise ValueError(
+                        f"`normalization_stats[{key}]` is provided but `{key}` has no normalization mode."
+                    )
+                if key not in shapes:
+                    raise ValueError(
+                        f"`normalization_stats[{key}]` is provided but `{key}` is in neither `input_shapes` nor "
+                        "`output_shapes`."
+                    )
+                mode = normalization_modes[key]
+                if mode not in _REQUIRED_STATS_PER_NORMALIZATION_MODE:
+                    raise ValueError(
+                        f"The normalization mode of `{key}` must be one of "
+                        f"{list(_REQUIRED_STATS_PER_NORMALIZATION_MODE)}. Got {mode}."
+                    )
+                required_stats = _REQUIRED_STATS_PER_NORMALIZATION_MODE[mode]
+                if not set(required_stats).issubset(stats):
+                    raise ValueError(
+                        f"`normalization_stats[{key}]` must provide {list(required_stats)} for the {mode} mode. "
+                        f"Got {list(stats)}."
+                    )
+                # Image statistics are per channel, others per feature: either way they match the first dim.
+                for stat, value in stats.items():
+                    if not isinstance(value, Sequence) or isinstance(value, str):
+                        raise ValueError(
+                            f"`normalization_stats[{key}][{stat}]` must be a sequence of numbers. Got {value!r}."
+                        )
+                    if len(value) != shapes[key][0]:
+                        raise ValueError(
+                            f"`normalization_stats[{key}][{stat}]` must have length {shapes[key][0]} to match "
+                            f"the shape {shapes[key]} of `{key}`. Got length {len(value)}."
+                        )
+            object.__setattr__(
+                self,
+                "normalization_stats",
+                {
+                    sys.intern(k): {stat: tuple(v) for stat, v in stats.items()}
+                    for k, stats in self.normalization_stats.items()
+                },
+            )
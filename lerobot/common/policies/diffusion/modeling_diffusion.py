@@ -61,12 +61,16 @@ class DiffusionPolicy(nn.Module, PyTorchModelHubMixin):
             config: Policy configuration class instance or None, in which case the default instantiation of
                 the configuration class is used.
             dataset_stats: Dataset statistics to be used for normalization. If not passed here, it is expected
-                that they will be passed with a call to `load_state_dict` before the policy is used.
+                that they will be passed with a call to `load_state_dict` before the policy is used. Statistics
+                provided in `config.normalization_stats` take precedence.
         """
         super().__init__()
         if config is None:
             config = DiffusionConfig()
         self.config = config
+        config_stats = None if config.normalization_stats is None else _normalization_stats_to_tensors(config)
+        if dataset_stats is not None and config_stats is not None:
+            dataset_stats = {**dataset_stats, **config_stats}
         self.normalize_inputs = Normalize(
             config.input_shapes, config.input_normalization_modes, dataset_stats
         )
@@ -76,6 +80,11 @@ class DiffusionPolicy(nn.Module, PyTorchModelHubMixin):
         self.unnormalize_outputs = Unnormalize(
             config.output_shapes, config.output_normalization_modes, dataset_stats
         )
+        if dataset_stats is None and config_stats is not None:
+            # Without dataset statistics, only the modalities covered by `config.normalization_stats` are filled
+            # in here. The others are expected to be loaded with `load_state_dict`.
+            for module in (self.normalize_inputs, self.normalize_targets, self.unnormalize_outputs):
+                module.load_stats(config_stats)
 
         # queues are populated during rollout of the policy, they contain the n latest observations and actions
         self._queues = None
@@ -143,6 +152,20 @@ class DiffusionPolicy(nn.Module, PyTorchModelHubMixin):
         return {"loss": loss}
 
 
+def _normalization_stats_to_tensors(config: DiffusionConfig) -> dict[str, dict[str, Tensor]]:
+    """Convert `config.normalization_stats` to tensors shaped like the `Normalize` buffers.
+
+    Image statistics are per channel and are reshaped to (c, 1, 1) to broadcast over height and width.
+    """
+    stats = {}
+    for key, key_stats in config.normalization_stats.items():
+        shape = (-1, 1, 1) if "image" in key else (-1,)
+        stats[key] = {
+            stat: torch.tensor(value, dtype=torch.float32).reshape(shape) for stat, value in key_stats.items()
+        }
+    return stats
+
+
 def _make_noise_scheduler(name: str, **kwargs: dict) -> DDPMScheduler | DDIMScheduler:
     """
     Factory for noise scheduler instances of the requested type. All kwargs are passed
@@ -182,10 +205,7 @@ class DiffusionModel(nn.Module):
             prediction_type=config.prediction_type,
         )
 
-        if config.num_inference_steps is None:
-            self.num_inference_steps = self.noise_scheduler.config.num_train_timesteps
-        else:
-            self.num_inference_steps = config.num_inference_steps
+        self.num_inference_steps = config.resolved_num_inference_steps
 
     # ========= inference  ============
     def conditional_sample(
@@ -204,18 +224,28 @@ class DiffusionModel(nn.Module):
 
         self.noise_scheduler.set_timesteps(self.num_inference_steps)
 
-        for t in self.noise_scheduler.timesteps:
-            # Predict model output.
-            model_output = self.unet(
-                sample,
-                torch.full(sample.shape[:1], t, dtype=torch.long, device=sample.device),
-                global_cond=global_cond,
-            )
+        model_output = None
+        for i, t in enumerate(self.noise_scheduler.timesteps):
+            # Predict model output (or reuse the cached one if this step is in the stable range, see
+            # `DiffusionConfig.dp_cache_stable_range`).
+            if model_output is None or not self._reuse_cached_model_output(i):
+                model_output = self.unet(
+                    sample,
+                    torch.full(sample.shape[:1], t, dtype=torch.long, device=sample.device),
+                    global_cond=global_cond,
+                )
             # Compute previous image: x_t -> x_t-1
             sample = self.noise_scheduler.step(model_output, t, sample, generator=generator).prev_sample
 
         return sample
 
+    def _reuse_cached_model_output(self, step_index: int) -> bool:
+        """Whether the Unet output from the previous reverse diffusion step can be reused at `step_index`."""
+        if self.config.dp_cache_stable_range is None:
+            return False
+        start, end = self.config.dp_cache_stable_range
+        return start <= step_index < end and (step_index - start) % self.config.dp_cache_stride != 0
+
     def _prepare_global_conditioning(self, batch: dict[str, Tensor]) -> Tensor:
         """Encode image features and concatenate them all together along with the state vector."""
         batch_size, n_obs_steps = batch["observation.state"].shape[:2]
@@ -427,16 +457,12 @@ class DiffusionRgbEncoder(nn.Module):
 
         # Set up pooling and final layers.
         # Use a dry run to get the feature map shape.
-        # The dummy input should take the number of image channels from `config.input_shapes` and it should
-        # use the height and width from `config.crop_shape` if it is provided, otherwise it should use the
-        # height and width from `config.input_shapes`.
+        # The dummy input should take the number of image channels from `config.input_shapes` and its height
+        # and width from `config.resolved_crop_shape`.
         image_keys = [k for k in config.input_shapes if k.startswith("observation.image")]
         # Note: we have a check in the config class to make sure all images have the same shape.
         image_key = image_keys[0]
-        dummy_input_h_w = (
-            config.crop_shape if config.crop_shape is not None else config.input_shapes[image_key][1:]
-        )
-        dummy_input = torch.zeros(size=(1, config.input_shapes[image_key][0], *dummy_input_h_w))
+        dummy_input = torch.zeros(size=(1, config.input_shapes[image_key][0], *config.resolved_crop_shape))
         with torch.inference_mode():
             dummy_feature_map = self.backbone(dummy_input)
         feature_map_shape = tuple(dummy_feature_map.shape[1:])
@@ -87,6 +87,23 @@ def create_stats_buffers(
     return stats_buffers
 
 
+def _stats_buffer_name(key: str) -> str:
+    """Name of the attribute holding the statistics buffer of modality `key` (e.g. "buffer_observation_state")."""
+    return "buffer_" + key.replace(".", "_")
+
+
+def _load_stats_into_buffers(module: nn.Module, stats: dict[str, dict[str, Tensor]]):
+    """Copy `stats` into the statistics buffers of a `Normalize` or `Unnormalize` module, for the modalities
+    that `stats` covers.
+    """
+    for key in module.modes:
+        if key not in stats:
+            continue
+        for stat, param in getattr(module, _stats_buffer_name(key)).items():
+            # Note: The clone is needed for the same reason as in `create_stats_buffers`.
+            param.data = stats[key][stat].clone()
+
+
 def _no_stats_error_str(name: str) -> str:
     return (
         f"`{name}` is infinity. You should either initialize with `stats` as an argument, or use a "
@@ -127,13 +144,19 @@ class Normalize(nn.Module):
         self.stats = stats
         stats_buffers = create_stats_buffers(shapes, modes, stats)
         for key, buffer in stats_buffers.items():
-            setattr(self, "buffer_" + key.replace(".", "_"), buffer)
+            setattr(self, _stats_buffer_name(key), buffer)
+
+    def load_stats(self, stats: dict[str, dict[str, Tensor]]):
+        """Overwrite the statistics buffers with `stats`. Unlike the `stats` argument of `__init__`, `stats`
+        may cover only some of the modalities, in which case the other buffers are left untouched.
+        """
+        _load_stats_into_buffers(self, stats)
 
     # TODO(rcadene): should we remove torch.no_grad?
     @torch.no_grad
     def forward(self, batch: dict[str, Tensor]) -> dict[str, Tensor]:
         for key, mode in self.modes.items():
-            buffer = getattr(self, "buffer_" + key.replace(".", "_"))
+            buffer = getattr(self, _stats_buffer_name(key))
 
             if mode == "mean_std":
                 mean = buffer["mean"]
@@ -192,13 +215,19 @@ class Unnormalize(nn.Module):
         # `self.buffer_observation_state["mean"]` contains `torch.tensor(state_dim)`
         stats_buffers = create_stats_buffers(shapes, modes, stats)
         for key, buffer in stats_buffers.items():
-            setattr(self, "buffer_" + key.replace(".", "_"), buffer)
+            setattr(self, _stats_buffer_name(key), buffer)
+
+    def load_stats(self, stats: dict[str, dict[str, Tensor]]):
+        """Overwrite the statistics buffers with `stats`. Unlike the `stats` argument of `__init__`, `stats`
+        may cover only some of the modalities, in which case the other buffers are left untouched.
+        """
+        _load_stats_into_buffers(self, stats)
 
     # TODO(rcadene): should we remove torch.no_grad?
     @torch.no_grad
     def forward(self, batch: dict[str, Tensor]) -> dict[str, Tensor]:
         for key, mode in self.modes.items():
-            buffer = getattr(self, "buffer_" + key.replace(".", "_"))
+            buffer = getattr(self, _stats_buffer_name(key))
 
             if mode == "mean_std":
                 mean = buffer["mean"]
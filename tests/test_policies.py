@@ -26,6 +26,8 @@ from lerobot.common.datasets.factory import make_dataset
 from lerobot.common.datasets.utils import cycle
 from lerobot.common.envs.factory import make_env
 from lerobot.common.envs.utils import preprocess_observation
+from lerobot.common.policies.diffusion.configuration_diffusion import DiffusionConfig
+from lerobot.common.policies.diffusion.modeling_diffusion import DiffusionModel, DiffusionPolicy
 from lerobot.common.policies.factory import get_policy_and_config_classes, make_policy
 from lerobot.common.policies.normalize import Normalize, Unnormalize
 from lerobot.common.policies.policy_protocol import Policy
@@ -49,6 +51,15 @@ def test_get_policy_and_config_classes(policy_name: str):
     [
         ("xarm", "tdmpc", ["policy.use_mpc=true", "dataset_repo_id=lerobot/xarm_lift_medium"]),
         ("pusht", "diffusion", []),
+        (
+            "pusht",
+            "diffusion",
+            [
+                "policy.num_inference_steps=10",
+                "policy.dp_cache_stable_range=[2,8]",
+                "policy.dp_cache_stride=3",
+            ],
+        ),
         ("aloha", "act", ["env.task=AlohaInsertion-v0", "dataset_repo_id=lerobot/aloha_sim_insertion_human"]),
         (
             "aloha",
@@ -219,6 +230,116 @@ def test_save_and_load_pretrained(policy_name: str):
     assert all(torch.equal(p, p_) for p, p_ in zip(policy.parameters(), policy_.parameters(), strict=True))
 
 
+@pytest.mark.parametrize(
+    "config_kwargs",
+    [
+        {"beta_schedule": "cosine"},
+        {"noise_scheduler_type": "DDIM", "beta_schedule": "sigmoid"},
+        {"num_train_timesteps": 0},
+        {"num_inference_steps": 0},
+        {"clip_sample_range": 0.0},
+        {"clip_sample_range": -1.0},
+    ],
+)
+def test_diffusion_config_validation(config_kwargs):
+    """Check that invalid noise scheduler settings are rejected."""
+    with pytest.raises(ValueError):
+        DiffusionConfig(**config_kwargs)
+
+
+def test_diffusion_config_accepts_ddpm_sigmoid_beta_schedule():
+    """The "sigmoid" beta schedule is only supported by the DDPM noise scheduler."""
+    DiffusionConfig(noise_scheduler_type="DDPM", beta_schedule="sigmoid")
+
+
+@pytest.mark.parametrize(
+    "dp_cache_kwargs, expected_unet_calls",
+    [
+        ({}, 10),
+        ({"dp_cache_stable_range": (2, 8), "dp_cache_stride": 1}, 10),
+        # Steps 0, 1 (before the range), 2, 5 (every 3rd step in the range) and 8, 9 (after the range).
+        ({"dp_cache_stable_range": (2, 8), "dp_cache_stride": 3}, 6),
+        ({"dp_cache_stable_range": (0, 10), "dp_cache_stride": 4}, 3),
+    ],
+)
+def test_diffusion_dp_cache_skips_unet_calls(dp_cache_kwargs, expected_unet_calls):
+    """Check that the DP-Cache schedule skips the expected number of Unet forward passes."""
+    config = DiffusionConfig(num_inference_steps=10, down_dims=(32, 64), **dp_cache_kwargs)
+    model = DiffusionModel(config)
+    unet_calls = []
+    model.unet.register_forward_hook(lambda *_: unet_calls.append(1))
+    global_cond_dim = (
+        config.input_shapes["observation.state"][0] + model.rgb_encoder.feature_dim
+    ) * config.n_obs_steps
+    with torch.no_grad():
+        model.conditional_sample(1, global_cond=torch.zeros(1, global_cond_dim))
+    assert len(unet_calls) == expected_unet_calls
+
+
+@pytest.mark.parametrize(
+    "dp_cache_kwargs",
+    [
+        {"dp_cache_stride": 0},
+        {"dp_cache_stable_range": (2, 11)},
+        {"dp_cache_stable_range": (5, 5)},
+        {"dp_cache_stable_range": (-1, 5)},
+        {"dp_cache_stable_range": (1, 2, 3)},
+    ],
+)
+def test_diffusion_dp_cache_config_validation(dp_cache_kwargs):
+    """Check that invalid DP-Cache schedules are rejected."""
+    with pytest.raises(ValueError):
+        DiffusionConfig(num_inference_steps=10, **dp_cache_kwargs)
+
+
+def test_diffusion_normalization_stats_from_config():
+    """Check that `DiffusionConfig.normalization_stats` is used to fill the normalization buffers."""
+    config = DiffusionConfig(
+        normalization_stats={
+            "observation.image": {"mean": (0.5, 0.5, 0.5), "std": (0.25, 0.25, 0.25)},
+            "observation.state": {"min": (0.0, 0.0), "max": (512.0, 512.0)},
+            "action": {"min": (0.0, 0.0), "max": (512.0, 512.0)},
+        }
+    )
+    policy = DiffusionPolicy(config)
+    torch.testing.assert_close(
+        policy.normalize_inputs.buffer_observation_image["std"], torch.full((3, 1, 1), 0.25)
+    )
+    torch.testing.assert_close(
+        policy.normalize_inputs.buffer_observation_state["max"], torch.full((2,), 512.0)
+    )
+    torch.testing.assert_close(policy.unnormalize_outputs.buffer_action["min"], torch.zeros(2))
+
+    # Modalities not covered by `normalization_stats` are left to be loaded with `load_state_dict`.
+    config = DiffusionConfig(
+        normalization_stats={"observation.state": {"min": (0.0, 0.0), "max": (1.0, 1.0)}}
+    )
+    policy = DiffusionPolicy(config)
+    torch.testing.assert_close(policy.normalize_inputs.buffer_observation_state["max"], torch.ones(2))
+    assert torch.isinf(policy.unnormalize_outputs.buffer_action["min"]).all()
+
+    with pytest.raises(ValueError):
+        DiffusionConfig(normalization_stats={"action": {"mean": (0.0, 0.0), "std": (1.0, 1.0)}})
+    # The statistics must match the channel / feature dimension of the modality.
+    with pytest.raises(ValueError):
+        DiffusionConfig(normalization_stats={"action": {"min": (0.0,), "max": (512.0,)}})
+    with pytest.raises(ValueError):
+        DiffusionConfig(normalization_stats={"observation.image": {"mean": (0.5,) * 96, "std": (0.25,) * 96}})
+    # Scalar statistics, unsupported normalization modes and modalities without a shape are rejected too.
+    with pytest.raises(ValueError):
+        DiffusionConfig(normalization_stats={"action": {"min": 0.0, "max": 512.0}})
+    with pytest.raises(ValueError):
+        DiffusionConfig(
+            output_normalization_modes={"action": "max_abs"},
+            normalization_stats={"action": {"min": (0.0, 0.0), "max": (512.0, 512.0)}},
+        )
+    with pytest.raises(ValueError):
+        DiffusionConfig(
+            output_normalization_modes={"action": "min_max", "reward": "min_max"},
+            normalization_stats={"reward": {"min": (0.0,), "max": (1.0,)}},
+        )
+
+
 @pytest.mark.parametrize("insert_temporal_dim", [False, True])
 def test_normalize(insert_temporal_dim):
     """
@@ -313,6 +434,17 @@ def test_normalize(insert_temporal_dim):
     new_unnormalize.load_state_dict(unnormalize.state_dict())
     unnormalize(output_batch)
 
+    # test loading stats for only some of the modalities
+    normalize = Normalize(input_shapes, normalize_input_modes, stats=None)
+    normalize.load_stats({"observation.state": dataset_stats["observation.state"]})
+    torch.testing.assert_close(
+        normalize.buffer_observation_state["min"], dataset_stats["observation.state"]["min"]
+    )
+    with pytest.raises(AssertionError):
+        normalize(input_batch)
+    normalize.load_stats({"observation.image": dataset_stats["observation.image"]})
+    normalize(input_batch)
+
 
 @pytest.mark.parametrize(
     "env_name, policy_name, extra_overrides, file_name_extra",